@@ -0,0 +1,37 @@
+#!/usr/bin/env python3
+"""
+build_verify.py
+
+Ahead-of-time compiles the block-sieve check from sieve.py into a regular
+C extension module, verify_c, next to this script. verify.py imports it when
+present, which skips importing Numba and probing the JIT cache on every run.
+
+Usage (once, and again after editing sieve.py):
+  python build_verify.py
+"""
+
+from pathlib import Path
+
+from numba.pycc import CC
+
+from sieve import verify_row
+
+cc = CC("verify_c")
+cc.output_dir = str(Path(__file__).resolve().parent)
+
+
+@cc.export("verify_core", "UniTuple(i8, 2)(i8, i8, i8[:])")
+def verify_core(k, m, primes):
+    """
+    (1, 0) if every number in m+1..m+k has a prime factor > k,
+    otherwise (0, failing number). 'primes' must cover 2..min(k, sqrt(m+k)).
+    """
+    bad = verify_row(k, m, primes)
+    if bad:
+        return 0, bad
+    return 1, 0
+
+
+if __name__ == "__main__":
+    cc.compile()
+    print(f"Wrote: {cc.output_dir}/{cc.output_file}")
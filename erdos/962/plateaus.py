@@ -0,0 +1,50 @@
+"""
+plateaus.py
+
+Loader for km_plateaus.csv shared by the Erdős #962 scripts.
+
+The parsed table is cached next to the CSV as a .npy file (km_plateaus.npy),
+which is reused for as long as it is at least as new as the CSV.
+"""
+
+from pathlib import Path
+
+import numpy as np
+
+
+def load_plateaus(csv_path):
+    """
+    Accepts either:
+      - headered CSV with columns k,m
+      - or two-column CSV without header
+    Returns an int64 array of shape (N, 2) holding the (k, m) rows in file order.
+    Raises FileNotFoundError if the CSV is missing.
+    """
+    csv_path = Path(csv_path)
+    npy_path = csv_path.with_suffix(".npy")
+
+    csv_mtime = csv_path.stat().st_mtime
+    if npy_path.exists() and npy_path.stat().st_mtime >= csv_mtime:
+        return np.load(npy_path)
+
+    with open(csv_path) as f:
+        first = f.readline().strip()
+    has_header = bool(first) and not first[0].isdigit()
+
+    arr = np.loadtxt(
+        csv_path,
+        delimiter=",",
+        dtype=np.int64,
+        comments="#",
+        skiprows=1 if has_header else 0,
+        usecols=(0, 1),
+        ndmin=2,
+    )
+    if arr.size == 0:
+        arr = np.zeros((0, 2), dtype=np.int64)
+
+    try:
+        np.save(npy_path, arr)
+    except OSError:
+        pass # read-only checkout: just parse again next time
+    return arr
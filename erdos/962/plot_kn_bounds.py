@@ -20,107 +20,81 @@ Usage:
 """
 
 import argparse
-import csv
 import math
-from bisect import bisect_right
 from pathlib import Path
 
-import matplotlib.pyplot as plt
+import numpy as np
 
+from plateaus import load_plateaus
 
-def read_plateaus(csv_path: Path):
+
+def read_plateaus(csv_path: Path) -> np.ndarray:
     """
     Accepts either:
       - headered CSV with columns k,m
       - or two-column CSV without header
-    Returns sorted list of (k, m).
+    Returns an int64 array of shape (N, 2): column 0 is k, column 1 is m,
+    rows sorted by (k, m).
     """
-    rows = []
-    with open(csv_path, newline="") as f:
-        sample = f.read(4096)
-        f.seek(0)
-        has_header = ("k" in sample.lower() and "m" in sample.lower())
-
-        if has_header:
-            rdr = csv.DictReader(f)
-            for r in rdr:
-                if not r:
-                    continue
-                k = int(str(r["k"]).strip())
-                m = int(str(r["m"]).strip())
-                rows.append((k, m))
-        else:
-            rdr = csv.reader(f)
-            for r in rdr:
-                if not r:
-                    continue
-                k = int(str(r[0]).strip())
-                m = int(str(r[1]).strip())
-                rows.append((k, m))
-
-    rows.sort()
-    return rows
-
-
-def log_grid(xmin: float, xmax: float, points: int):
+    rows = load_plateaus(csv_path)
+    return rows[np.lexsort((rows[:, 1], rows[:, 0]))]
+
+
+def log_grid(xmin: float, xmax: float, points: int) -> np.ndarray:
     xmin = float(xmin)
     xmax = float(xmax)
     if xmin <= 0 or xmax <= 0 or xmax <= xmin:
-        return [xmin]
-
-    lo = math.log(xmin)
-    hi = math.log(xmax)
-    out = []
-    last = None
-    for i in range(points + 1):
-        x = math.exp(lo + (hi - lo) * (i / points))
-        # keep floats; grid is for smooth curves
-        if last is None or x != last:
-            out.append(x)
-            last = x
-    return out
+        return np.array([xmin])
+
+    # keep floats; grid is for smooth curves (unique drops float-rounding repeats)
+    return np.unique(np.geomspace(xmin, xmax, points + 1))
 
 
 # ---- Bound "shapes" (drop constants / o(1) terms) ----
+# Each takes an array of n and evaluates the whole grid at once.
 
-def tao_upper(n: float) -> float:
+_E_TO_E = math.e ** math.e  # tang_lower is only drawn for n > e^e
+_INV_SQRT2 = 1.0 / math.sqrt(2.0)
+
+
+def tao_upper(n: np.ndarray) -> np.ndarray:
     # k(n) <= (1+o(1))*sqrt(n)  -> plot sqrt(n)
-    return math.sqrt(n)
+    return np.sqrt(n)
 
 
-def tang_lower(n: float) -> float:
+def tang_lower(n: np.ndarray) -> np.ndarray:
     # k(n) >= exp((1/sqrt(2)-o(1))*sqrt(log n log log n))
     # -> plot exp((1/sqrt(2))*sqrt(log n log log n)) for n>e^e
-    if n <= math.e ** math.e:
-        return float("nan")
-    L = math.log(n)
-    return math.exp((1.0 / math.sqrt(2.0)) * math.sqrt(L * math.log(L)))
+    n = np.asarray(n, dtype=float)
+    out = np.full(n.shape, np.nan)
+    ok = n > _E_TO_E
+    L = np.log(n[ok])
+    out[ok] = np.exp(_INV_SQRT2 * np.sqrt(L * np.log(L)))
+    return out
 
 
-def erdos_lower(n: float, eps: float, scale: float) -> float:
+def erdos_lower(n: np.ndarray, eps: float, scale: float) -> np.ndarray:
     # Erdős: k(n) >>_eps exp((log n)^(1/2 - eps))
     # -> plot scale * exp((log n)^(1/2 - eps))
-    if n <= 1.0:
-        return float("nan")
-    L = math.log(n)
+    n = np.asarray(n, dtype=float)
+    out = np.full(n.shape, np.nan)
     power = 0.5 - eps
     if power <= 0:
-        return float("nan")
-    return scale * math.exp(L ** power)
+        return out
+    ok = n > 1.0
+    out[ok] = scale * np.exp(np.log(n[ok]) ** power)
+    return out
 
 
 # ---- k(n) from m(k) plateau data ----
 
-def k_of_n_from_mk(n: float, mk_sorted_by_m):
+def k_of_n_from_mk(n: np.ndarray, ms: np.ndarray, ks: np.ndarray) -> np.ndarray:
     """
-    mk_sorted_by_m: list of (m, k) sorted by m increasing
-    returns max k such that m(k) <= n (step function)
+    ms, ks: plateau starts m(k) and their k, sorted by m increasing
+    returns max k such that m(k) <= n (step function) for every n
     """
-    ms = [mk[0] for mk in mk_sorted_by_m]
-    idx = bisect_right(ms, n) - 1
-    if idx < 0:
-        return 0
-    return mk_sorted_by_m[idx][1]
+    idx = np.searchsorted(ms, n, side="right") - 1
+    return np.where(idx < 0, 0, ks[np.clip(idx, 0, None)])
 
 
 def main():
@@ -142,22 +116,30 @@ def main():
     args = ap.parse_args()
 
     pts_km = read_plateaus(Path(args.csv))
-    if not pts_km:
+    if len(pts_km) == 0:
         raise SystemExit("No data loaded.")
 
     # Invert data as (n=m, k) "first attainment" points
-    n_data = [m for (k, m) in pts_km]
-    k_data = [k for (k, m) in pts_km]
+    n_data = pts_km[:, 1]
+    k_data = pts_km[:, 0]
 
-    nmin = args.nmin if args.nmin is not None else float(min(n_data))
-    nmax = args.nmax if args.nmax is not None else float(max(n_data))
+    nmin = args.nmin if args.nmin is not None else float(n_data.min())
+    nmax = args.nmax if args.nmax is not None else float(n_data.max())
 
-    # For step function: sort by m
-    mk_sorted_by_m = sorted([(m, k) for (k, m) in pts_km], key=lambda x: x[0])
+    # For step function: sort by m (stable, so equal m keep increasing k)
+    order = np.argsort(n_data, kind="stable")
+    ms_sorted = n_data[order]
+    ks_sorted = k_data[order]
 
     # Smooth grid for bounds (float)
     grid = log_grid(nmin, nmax, args.grid)
 
+    # Imported here so the helpers above load without matplotlib; the script
+    # only writes a PNG, so use Agg and skip interactive backend probing.
+    import matplotlib
+    matplotlib.use("Agg")
+    import matplotlib.pyplot as plt
+
     plt.figure(figsize=(9, 6))
 
     # data points
@@ -165,19 +147,19 @@ def main():
 
     # step function sampling
     if args.step:
-        k_step = [k_of_n_from_mk(x, mk_sorted_by_m) for x in grid]
+        k_step = k_of_n_from_mk(grid, ms_sorted, ks_sorted)
         plt.loglog(grid, k_step, label="Step function: k(n)=max{k: m(k)≤n}")
 
     if not args.no_tao:
-        plt.loglog(grid, [tao_upper(x) for x in grid], label="Tao upper (shape): k(n) ≈ √n")
+        plt.loglog(grid, tao_upper(grid), label="Tao upper (shape): k(n) ≈ √n")
 
     if not args.no_tang:
-        plt.loglog(grid, [tang_lower(x) for x in grid], label="Tang lower (shape): exp((1/√2)√(log n log log n))")
+        plt.loglog(grid, tang_lower(grid), label="Tang lower (shape): exp((1/√2)√(log n log log n))")
 
     if not args.no_erdos:
         plt.loglog(
             grid,
-            [erdos_lower(x, args.erdos_eps, args.erdos_scale) for x in grid],
+            erdos_lower(grid, args.erdos_eps, args.erdos_scale),
             label=f"Erdős lower (shape): scale·exp((log n)^(1/2-ε)), ε={args.erdos_eps:g}",
         )
 
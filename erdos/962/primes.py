@@ -0,0 +1,32 @@
+"""
+primes.py
+
+Prime table for the Erdős #962 scripts. Plain NumPy, so it loads without Numba.
+"""
+
+import math
+
+import numpy as np
+
+
+def prime_flags(n):
+    """
+    Sieve of Eratosthenes. Returns a bool array 'flags' of length n+1
+    with flags[p] True exactly when p is prime.
+    One byte per entry, so lookups for any k in the dataset stay in cache.
+    """
+    flags = np.ones(max(n, 1) + 1, dtype=np.bool_)
+    flags[:2] = False
+    flags[4::2] = False
+    # evens are done: odd primes only need to clear their odd multiples
+    for i in range(3, math.isqrt(n) + 1, 2):
+        if flags[i]:
+            flags[i * i::2 * i] = False
+    return flags[:n + 1]
+
+
+def primes_upto(n):
+    """
+    Returns all primes <= n as an int64 array.
+    """
+    return np.flatnonzero(prime_flags(n)).astype(np.int64)
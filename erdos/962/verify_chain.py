@@ -1,6 +1,13 @@
+import math
 import sys
 import time
 
+import numpy as np
+from numba import njit
+
+from plateaus import load_plateaus
+from sieve import fill_block, prime_flags, strip_prime
+
 def get_prime_factors_map(n):
     """
     Returns a set of prime factors for n. 
@@ -12,27 +19,21 @@ def get_prime_factors_map(n):
     temp = n
     # We only strictly need factors up to ~5000 (max k)
     # But for correctness, we just strip what we find.
-    while d * d <= temp:
+    # The bound sqrt(temp) only moves when temp shrinks, so recompute it there.
+    sqrt_temp = math.isqrt(temp)
+    while d <= sqrt_temp:
         if temp % d == 0:
             factors.add(d)
             while temp % d == 0:
                 temp //= d
+            sqrt_temp = math.isqrt(temp)
         d += 1
     if temp > 1:
         factors.add(temp)
     return factors
 
-def is_prime(n):
-    if n < 2: return False
-    if n == 2: return True
-    if n % 2 == 0: return False
-    d = 3
-    while d * d <= n:
-        if n % d == 0: return False
-        d += 2
-    return True
-
-def measure_true_length(k_start, m):
+@njit(cache=True)
+def measure_true_length(k_start, m, sieve, buf, limit_slack=2000):
     """
     Determines the maximum 'z' such that for all i in 1..z:
       P(m+i) > z
@@ -41,45 +42,31 @@ def measure_true_length(k_start, m):
     1. Initialize array of values [m+1 ... m+limit]
     2. Strip factors <= k_start
     3. Incrementally increase z, stripping new prime factors as z grows.
+
+    'sieve' is a prime_flags() table covering at least k_start + limit_slack,
+    and 'buf' an int64 scratch array of at least k_start + limit_slack + 1
+    entries (reused across rows; its contents are overwritten).
+    Returns -1 if the base block is invalid, -2 if the buffer runs out.
     """
     
     # Heuristic: We don't expect the true length to be MASSIVELY larger 
     # than k in this specific dataset context, but allow some headroom.
     # If the plateau extends further, we'd need a dynamic array, but 
     # for verification this fixed buffer is usually sufficient.
-    limit = k_start + 2000 
+    limit = k_start + limit_slack
     
     # residues[i] corresponds to m + i (1-based index)
     # We essentially track the "remaining part" of the number after division.
     # index 0 is unused to match 1-based logic.
-    residues = [0] * (limit + 1)
+    residues = buf[:limit + 1]
     
     # 1. Init and pre-strip factors <= k_start
-    for i in range(1, limit + 1):
-        val = m + i
-        # Strip all primes <= k_start
-        # (In Python this is slow to do fully, so we assume the input k is valid
-        # and just strip factors that are <= k_start).
-        # Optimization: We only need to check divisibility by primes.
-        
-        # However, to be robust, let's just use the 'val' and reduce it
-        # dynamically in the loop below.
-        residues[i] = val
+    fill_block(residues, m, limit)
 
-    # To be efficient in Python, we simulate the Sieve:
     # Iterate p from 2 to k_start: divide out p from the whole array.
     for p in range(2, k_start + 1):
-        if not is_prime(p): continue
-        
-        # Start at first multiple of p > m
-        # first index i such that m+i is divisible by p
-        # (m+i) % p == 0  =>  i % p == (-m) % p
-        rem = (-m) % p
-        if rem == 0: rem = p
-        
-        for i in range(rem, limit + 1, p):
-            while residues[i] % p == 0:
-                residues[i] //= p
+        if sieve[p]:
+            strip_prime(residues, m, limit, p)
 
     # 2. Check base validity (1..k_start)
     for i in range(1, k_start + 1):
@@ -94,25 +81,19 @@ def measure_true_length(k_start, m):
         if next_z > limit:
             return -2 # Buffer limit reached (plateau is huge!)
 
-        # A. If next_z is prime, strip it from previous residues 1..current_z
-        if is_prime(next_z):
-            rem = (-m) % next_z
-            if rem == 0: rem = next_z
+        # A. If next_z is prime, strip it from the whole buffer: indices
+        # <= current_z decide the "existing" plateau validity, and the
+        # future indices need it gone before they are checked.
+        if sieve[next_z]:
+            hit = strip_prime(residues, m, limit, next_z, 1)
             
-            # We only care about indices <= current_z for the "existing" plateau validity
-            # But we must also strip it from future indices to prepare them.
-            # So strip from valid range...
-            for i in range(rem, limit + 1, next_z):
-                while residues[i] % next_z == 0:
-                    residues[i] //= next_z
-                
-                # If we stripped it from an index within the active plateau range
-                # and it became 1, the plateau breaks *at that index*.
-                # But wait: the condition is P(m+i) > next_z.
-                # If residue became 1, it means all factors were <= next_z.
-                # So P(m+i) <= next_z. FAIL condition met.
-                if i <= current_z and residues[i] == 1:
-                    return current_z # The expansion failed, true size is current_z
+            # If we stripped it from an index within the active plateau range
+            # and it became 1, the plateau breaks *at that index*.
+            # The condition is P(m+i) > next_z; a residue of 1 means
+            # all factors were <= next_z. FAIL condition met.
+            # ('hit' is the first index that became 1, so one test covers the range.)
+            if hit and hit <= current_z:
+                return current_z # The expansion failed, true size is current_z
 
         # B. Check the new item at index next_z
         # It has been stripped of all primes <= next_z (by the loop above and previous steps).
@@ -129,15 +110,8 @@ def main():
 
     print(f"Verifying chain coverage in {filename}...")
     
-    data = []
     try:
-        with open(filename, 'r') as f:
-            for line in f:
-                parts = line.split(',')
-                if len(parts) >= 2 and parts[0].strip().isdigit():
-                    k = int(parts[0])
-                    m = int(parts[1])
-                    data.append((k, m))
+        data = load_plateaus(filename).tolist()
     except FileNotFoundError:
         print("File not found.")
         return
@@ -147,6 +121,15 @@ def main():
     print(f"{'Row K':<10} | {'True Length':<15} | {'Next K':<10} | {'Status'}")
     print("-" * 60)
 
+    # One primality table and one scratch buffer cover every row
+    # (see measure_true_length)
+    max_limit = max((k for k, _ in data), default=0) + 2000
+    sieve = prime_flags(max_limit)
+    buf = np.empty(max_limit + 1, dtype=np.int64)
+
+    # Warm the JIT (or load it from the on-disk cache) outside the timed loop
+    measure_true_length(1, 1, sieve, buf)
+
     start_time = time.time()
     gaps = 0
 
@@ -154,7 +137,7 @@ def main():
         k, m = data[i]
         
         # Calculate how far this plateau *really* goes
-        true_len = measure_true_length(k, m)
+        true_len = measure_true_length(k, m, sieve, buf)
         
         if true_len == -1:
             print(f"{k:<10} | {'INVALID':<15} | {'-':<10} | FAIL (Base k invalid)")